@@ -5,18 +5,35 @@ Proof of concept: Extract MP3 URL from Overcast share links
 Usage: python overcast_poc.py <overcast_url>
 Example: python overcast_poc.py https://overcast.fm/+AAbggn-BZtw
 
-Requirements: pip install requests (or use uv)
+Requirements: none beyond the standard library
 """
 
+import gzip
+import html as _html
+import http.client
 import re
 import sys
+from urllib.parse import urljoin, urlsplit
 
-try:
-    import requests
-    USE_REQUESTS = True
-except ImportError:
-    from urllib.request import Request, urlopen
-    USE_REQUESTS = False
+# Redirect hops to follow before giving up
+_MAX_REDIRECTS = 5
+
+_AUDIO_PATTERNS = tuple(
+    re.compile(p)
+    for p in (
+        r'<source\s+src="([^"]+)"',
+        r'<audio[^>]+src="([^"]+)"',
+        r'"audio_url"\s*:\s*"([^"]+)"',  # JSON format
+    )
+)
+_TITLE_PATTERNS = tuple(
+    re.compile(p)
+    for p in (
+        r'<meta\s+name="og:title"\s+content="([^"]+)"',
+        r'<meta\s+property="og:title"\s+content="([^"]+)"',
+        r"<title>([^<]+)</title>",
+    )
+)
 
 
 def fetch_page(url: str) -> str:
@@ -29,29 +46,45 @@ def fetch_page(url: str) -> str:
         ),
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
         "Accept-Language": "en-US,en;q=0.9",
+        "Accept-Encoding": "gzip",
     }
     
-    if USE_REQUESTS:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        return response.text
-    else:
-        req = Request(url, headers=headers)
-        with urlopen(req) as response:
-            return response.read().decode("utf-8")
+    for _ in range(_MAX_REDIRECTS + 1):
+        parts = urlsplit(url)
+        conn_class = (
+            http.client.HTTPSConnection
+            if parts.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        conn = conn_class(parts.netloc, timeout=10)
+        try:
+            path = parts.path or "/"
+            if parts.query:
+                path += "?" + parts.query
+            conn.request("GET", path, headers=headers)
+            response = conn.getresponse()
+            body = response.read()
+        finally:
+            conn.close()
+        
+        location = response.getheader("Location")
+        if response.status in (301, 302, 303, 307, 308) and location:
+            url = urljoin(url, location)
+            continue
+        if response.status >= 400:
+            raise RuntimeError(f"HTTP {response.status} {response.reason} for {url}")
+        if response.getheader("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        return body.decode(response.headers.get_content_charset() or "utf-8")
+    
+    raise RuntimeError(f"Too many redirects fetching {url}")
 
 
 def extract_audio_url(html: str) -> str | None:
     """Extract the audio source URL from the page HTML."""
     # Look for <source src="..."> or <audio src="...">
-    patterns = [
-        r'<source\s+src="([^"]+)"',
-        r'<audio[^>]+src="([^"]+)"',
-        r'"audio_url"\s*:\s*"([^"]+)"',  # JSON format
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, html)
+    for pattern in _AUDIO_PATTERNS:
+        match = pattern.search(html)
         if match:
             url = match.group(1)
             # Strip any timestamp fragment (e.g., #t=0)
@@ -63,20 +96,12 @@ def extract_audio_url(html: str) -> str | None:
 
 def extract_title(html: str) -> str | None:
     """Extract episode title from meta tags."""
-    patterns = [
-        r'<meta\s+name="og:title"\s+content="([^"]+)"',
-        r'<meta\s+property="og:title"\s+content="([^"]+)"',
-        r"<title>([^<]+)</title>",
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, html)
+    for pattern in _TITLE_PATTERNS:
+        match = pattern.search(html)
         if match:
             title = match.group(1)
             # Clean up HTML entities
-            title = title.replace("&mdash;", "—")
-            title = title.replace("&amp;", "&")
-            title = title.replace("&#39;", "'")
+            title = _html.unescape(title)
             return title
     return None
 
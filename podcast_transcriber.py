@@ -2,176 +2,903 @@
 """
 Podcast Transcriber - Extract audio from Overcast links and transcribe with Whisper
 
-Usage: python podcast_transcriber.py <overcast_url>
+Usage: python podcast_transcriber.py [--stream | --batch-size N] <overcast_url>
+       python podcast_transcriber.py --serve [--socket PATH]
 Example: python podcast_transcriber.py https://overcast.fm/+AAbggn-BZtw
 
+With --stream, the audio is cut into 30 s segments by ffmpeg as it downloads
+and each segment is transcribed as soon as it is complete. With --batch-size,
+the downloaded episode is split into 30 s windows and N of them go through the
+model in a single batched forward pass. With --serve, the model stays loaded
+and Overcast URLs are read one per line from stdin (or a Unix socket).
+
 Requirements (install with uv):
     uv add requests mlx-whisper
 
 The transcript will be saved as a .txt file in the current directory.
 """
 
+import argparse
+import contextlib
+import errno
+import functools
+import hashlib
 import html
+import json
+import os
 import re
+import shutil
+import socket
+import stat
+import subprocess
 import sys
 import tempfile
+import threading
+import wave
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from collections.abc import Generator, Iterable, Iterator
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+    import requests
+
+# All audio and title patterns fused into one alternation so the page is
+# scanned once. Within each kind, groups are listed in priority order. The
+# pattern runs on the raw page bytes; only the matched values get decoded.
+# Shared prefixes ("<", "<meta\s+") are factored out, trie-style, so each "<"
+# in the page is tested against one branch instead of five.
+_AUDIO_GROUPS = ("audio_source", "audio_tag", "audio_json")
+_TITLE_GROUPS = ("title_og_name", "title_og_property", "title_tag")
+_METADATA_PATTERN = re.compile(
+    rb"<(?:"
+    rb'source\s+src="(?P<audio_source>[^"]+)"'
+    rb'|audio[^>]+src="(?P<audio_tag>[^"]+)"'
+    rb"|meta\s+(?:"
+    rb'name="og:title"\s+content="(?P<title_og_name>[^"]+)"'
+    rb'|property="og:title"\s+content="(?P<title_og_property>[^"]+)"'
+    rb")"
+    rb"|title>(?P<title_tag>[^<]+)</title>"
+    rb")"
+    rb'|"audio_url"\s*:\s*"(?P<audio_json>[^"]+)"'
+)
+# Overcast puts the title and <audio> player near the top of the page, so
+# scan this many bytes first and only fall back to the full body on a miss
+_SCAN_WINDOW = 64 * 1024
+_PAGE_CHUNK_SIZE = 64 * 1024
+_PAGE_CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "podcast-transcriber"
+    / "pages"
+)
+_OVERCAST_SUFFIX = re.compile(r"\s*—\s*Overcast$")
+_FNAME_BAD = re.compile(r'[<>:"/\\|?*]')
+_FNAME_WS = re.compile(r"\s+")
+_AUDIO_CHUNK_SIZE = 1 << 20
+# (connect, read) timeout for every HTTP request, so a stalled connection
+# can't leave a download worker (and hence Ctrl-C or exit) blocked forever
+_HTTP_TIMEOUT = (10, 60)
+# Redraw the download progress line at most once per this many bytes
+_PROGRESS_STEP = 5_000_000
+# Parallel Range download: split the file into parts of this size and fetch
+# them over a few connections at once
+_RANGE_PART_SIZE = 4 << 20
+_RANGE_WORKERS = 4
+# posix_fallocate errors meaning "not supported here"; fall back to ftruncate
+_FALLOCATE_UNSUPPORTED = frozenset({errno.EOPNOTSUPP, errno.ENOTSUP, errno.EINVAL})
+# Segment length used by --stream; matches Whisper's 30 s input window
+_SEGMENT_SECONDS = 30
+# Whisper consumes 16 kHz mono float32 PCM
+_SAMPLE_RATE = 16_000
+
+# Use the large-v3-turbo model for good balance of speed and accuracy
+# Other options: "mlx-community/whisper-tiny-mlx" (fastest, less accurate)
+#                "mlx-community/whisper-large-v3-mlx" (most accurate, slower)
+# The mlx-community repos ship weights.safetensors, which mlx_whisper loads
+# in preference to the older .npz format.
+_WHISPER_MODEL = "mlx-community/whisper-large-v3-turbo"
+# mlx_whisper.transcribe()'s defaults for treating a window as silence
+_NO_SPEECH_THRESHOLD = 0.6
+_LOGPROB_THRESHOLD = -1.0
+
+_USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+
+@functools.cache
+def get_session() -> "requests.Session":
+    """Return the session shared by the page fetch and the audio download.
+
+    The page and the audio live on different hosts, so the reuse that matters
+    is on the audio CDN: the Range probe (HEAD) and the GET or parallel range
+    requests that follow draw on the same keep-alive pool. requests is
+    imported here, not at module load, so --help and usage errors don't pay
+    for loading it.
+    """
+    import requests
+    
+    session = requests.Session()
+    session.headers["User-Agent"] = _USER_AGENT
+    return session
 
-import requests
 
+def _page_cache_paths(url: str) -> tuple[Path, Path]:
+    """Return the (validators, body) cache file paths for a page URL."""
+    key = hashlib.sha1(url.encode()).hexdigest()
+    return _PAGE_CACHE_DIR / f"{key}.json", _PAGE_CACHE_DIR / f"{key}.html"
 
-def fetch_page(url: str) -> str:
-    """Fetch the Overcast page with browser-like headers."""
+
+def _load_cached_page(url: str) -> tuple[dict, bytes] | None:
+    """Return the cached (validators, body) for url, or None if not cached."""
+    meta_path, body_path = _page_cache_paths(url)
+    try:
+        return json.loads(meta_path.read_text()), body_path.read_bytes()
+    except (OSError, ValueError):
+        return None
+
+
+def _store_cached_page(url: str, response: "requests.Response", body: bytes) -> None:
+    """Cache body along with the response's ETag / Last-Modified, if any."""
+    validators = {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+    if not any(validators.values()):
+        return
+    meta_path, body_path = _page_cache_paths(url)
+    # The cache only saves a transfer; never fail the run over it
+    with contextlib.suppress(OSError):
+        _PAGE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        body_path.write_bytes(body)
+        meta_path.write_text(json.dumps(validators))
+
+
+def fetch_page(url: str, session: "requests.Session | None" = None) -> bytes:
+    """Fetch the raw Overcast page with browser-like headers.
+
+    Pages are cached on disk with their ETag / Last-Modified validators, and
+    a repeat fetch that gets 304 Not Modified returns the cached body.
+    """
     headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/120.0.0.0 Safari/537.36"
-        ),
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
         "Accept-Language": "en-US,en;q=0.9",
     }
-    response = requests.get(url, headers=headers)
+    session = session or get_session()
+    cached = _load_cached_page(url)
+    if cached:
+        validators, _ = cached
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+    
+    response = session.get(
+        url, headers=headers, stream=True, timeout=_HTTP_TIMEOUT
+    )
+    if cached and response.status_code == 304:
+        response.close()
+        return cached[1]
     response.raise_for_status()
-    return response.text
-
 
-def extract_audio_url(html: str) -> str | None:
-    """Extract the audio source URL from the page HTML."""
-    patterns = [
-        r'<source\s+src="([^"]+)"',
-        r'<audio[^>]+src="([^"]+)"',
-        r'"audio_url"\s*:\s*"([^"]+)"',
-    ]
+    # Stream the body and stop as soon as the scan window is complete and
+    # already holds both a title and an audio URL; the rest of the page
+    # would not change what extract_metadata() returns, so the truncated
+    # body is also what gets cached.
+    buf = bytearray()
+    window_checked = False
+    with response:
+        for chunk in response.iter_content(chunk_size=_PAGE_CHUNK_SIZE):
+            buf.extend(chunk)
+            if not window_checked and len(buf) >= _SCAN_WINDOW:
+                window_checked = True
+                if _has_metadata(_scan_metadata(buf[:_SCAN_WINDOW])):
+                    break
     
-    for pattern in patterns:
-        match = re.search(pattern, html)
-        if match:
-            url = match.group(1)
-            # Strip any timestamp fragment (e.g., #t=0)
-            if "#" in url:
-                url = url.split("#")[0]
-            return url
-    return None
+    body = bytes(buf)
+    _store_cached_page(url, response, body)
+    return body
 
 
-def extract_title(page_html: str) -> str | None:
-    """Extract episode title from meta tags."""
-    patterns = [
-        r'<meta\s+name="og:title"\s+content="([^"]+)"',
-        r'<meta\s+property="og:title"\s+content="([^"]+)"',
-        r"<title>([^<]+)</title>",
-    ]
+def _scan_metadata(page: bytes | bytearray) -> dict[str, bytes]:
+    """Return the first match for each named group of the metadata pattern."""
+    found: dict[str, bytes] = {}
+    for match in _METADATA_PATTERN.finditer(page):
+        found.setdefault(match.lastgroup, match.group(match.lastgroup))
+        # Stop once the preferred source of each kind has been seen
+        if _AUDIO_GROUPS[0] in found and _TITLE_GROUPS[0] in found:
+            break
+    return found
 
-    for pattern in patterns:
-        match = re.search(pattern, page_html)
-        if match:
-            title = match.group(1)
-            # Clean up HTML entities
-            title = html.unescape(title)
-            # Remove " — Overcast" suffix if present
-            title = re.sub(r"\s*—\s*Overcast$", "", title)
-            return title
+
+def _has_metadata(found: dict[str, bytes]) -> bool:
+    """Whether a scan found both an audio URL and a title."""
+    return any(g in found for g in _AUDIO_GROUPS) and any(
+        g in found for g in _TITLE_GROUPS
+    )
+
+
+def _decode_group(found: dict[str, bytes], groups: tuple[str, ...]) -> str | None:
+    """Decode the highest-priority match among groups, if any."""
+    for group in groups:
+        if group in found:
+            # Overcast serves UTF-8, so skip charset detection entirely
+            return found[group].decode("utf-8", "replace")
     return None
 
 
+class MetadataNotFound(Exception):
+    """The Overcast page did not contain the episode's audio URL."""
+
+
+def extract_metadata(page_html: bytes) -> tuple[str | None, str | None]:
+    """Extract (title, audio_url) from the raw page HTML in a single pass."""
+    found = _scan_metadata(page_html[:_SCAN_WINDOW])
+    if len(page_html) > _SCAN_WINDOW and not _has_metadata(found):
+        found = _scan_metadata(page_html)
+
+    audio_url = _decode_group(found, _AUDIO_GROUPS)
+    title = _decode_group(found, _TITLE_GROUPS)
+
+    if audio_url:
+        # Strip any timestamp fragment (e.g., #t=0)
+        if "#" in audio_url:
+            audio_url = audio_url.split("#")[0]
+    if title:
+        # Clean up HTML entities
+        title = html.unescape(title)
+        # Remove " — Overcast" suffix if present
+        title = _OVERCAST_SUFFIX.sub("", title)
+    return title, audio_url
+
+
+def extract_audio_url(page_html: bytes) -> str | None:
+    """Extract the audio source URL from the page HTML."""
+    return extract_metadata(page_html)[1]
+
+
+def extract_title(page_html: bytes) -> str | None:
+    """Extract episode title from meta tags."""
+    return extract_metadata(page_html)[0]
+
+
 def sanitize_filename(title: str) -> str:
     """Convert title to a safe filename."""
     # Remove or replace characters that aren't safe for filenames
-    safe = re.sub(r'[<>:"/\\|?*]', "", title)
-    safe = re.sub(r"\s+", " ", safe).strip()
+    safe = _FNAME_BAD.sub("", title)
+    safe = _FNAME_WS.sub(" ", safe).strip()
     # Truncate if too long
     if len(safe) > 100:
         safe = safe[:100].rsplit(" ", 1)[0]
     return safe
 
 
-def download_audio(url: str, output_path: Path) -> None:
-    """Download the audio file with progress indication."""
+class _Progress:
+    """Thread-safe byte counter that prints a throttled progress line."""
+
+    def __init__(self, total_size: int):
+        self.total_size = total_size
+        self.downloaded = 0
+        self._last_print = 0
+        self._lock = threading.Lock()
+
+    def update(self, nbytes: int) -> None:
+        with self._lock:
+            self.downloaded += nbytes
+            if nbytes and self.total_size and (
+                self.downloaded - self._last_print >= _PROGRESS_STEP
+                or self.downloaded >= self.total_size
+            ):
+                self._last_print = self.downloaded
+                pct = (self.downloaded / self.total_size) * 100
+                print(f"\r  {self.downloaded / 1_000_000:.1f} MB / {self.total_size / 1_000_000:.1f} MB ({pct:.0f}%)", end="")
+
+
+class _DownloadCancelled(Exception):
+    """download_audio() was asked to stop through its cancel event."""
+
+
+def _check_cancel(cancel: threading.Event | None) -> None:
+    """Raise _DownloadCancelled if cancel has been set."""
+    if cancel is not None and cancel.is_set():
+        raise _DownloadCancelled
+
+
+class _ProgressReader:
+    """Wrap a raw response stream and report progress as it is read."""
+
+    def __init__(self, raw, progress: _Progress, cancel: threading.Event | None = None):
+        self._raw = raw
+        self._progress = progress
+        self._cancel = cancel
+
+    def read(self, size: int = -1) -> bytes:
+        _check_cancel(self._cancel)
+        data = self._raw.read(size)
+        self._progress.update(len(data))
+        return data
+
+
+def _open_preallocated(output_path: Path, size: int) -> int:
+    """Open output_path for writing with size bytes reserved up front."""
+    fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    if not size:
+        return fd
+    try:
+        try:
+            # Reserve all blocks at once rather than growing the file chunk
+            # by chunk; posix_fallocate is missing on macOS
+            os.posix_fallocate(fd, 0, size)
+        except AttributeError:
+            os.ftruncate(fd, size)
+        except OSError as exc:
+            # Only a filesystem that cannot preallocate falls back; ENOSPC
+            # and the like mean the download would fail anyway
+            if exc.errno not in _FALLOCATE_UNSUPPORTED:
+                raise
+            os.ftruncate(fd, size)
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, size, os.POSIX_FADV_SEQUENTIAL)
+    except BaseException:
+        os.close(fd)
+        raise
+    return fd
+
+
+def _download_stream(
+    session: "requests.Session",
+    url: str,
+    output_path: Path,
+    cancel: threading.Event | None = None,
+) -> None:
+    """Download the whole file over a single connection."""
+    with session.get(url, stream=True, timeout=_HTTP_TIMEOUT) as response:
+        response.raise_for_status()
+        # Copy straight from the urllib3 stream, letting it undo any
+        # Content-Encoding, instead of going through iter_content()
+        response.raw.decode_content = True
+        total_size = int(response.headers.get("content-length", 0))
+        reader = _ProgressReader(response.raw, _Progress(total_size), cancel)
+        fd = _open_preallocated(output_path, total_size)
+        with os.fdopen(fd, "wb") as f:
+            shutil.copyfileobj(reader, f, length=_AUDIO_CHUNK_SIZE)
+            # Content-Length is only a hint here; drop any unused reservation
+            f.truncate()
+
+
+class _RangesUnsupported(Exception):
+    """The server advertised Accept-Ranges but answered a range with 200."""
+
+
+def _fetch_range(
+    session: "requests.Session",
+    url: str,
+    fd: int,
+    start: int,
+    end: int,
+    progress: _Progress,
+    cancel: threading.Event | None = None,
+) -> None:
+    """Fetch bytes start..end (inclusive) and write them at the same offset."""
+    headers = {"Range": f"bytes={start}-{end}", "Accept-Encoding": "identity"}
+    with session.get(
+        url, headers=headers, stream=True, timeout=_HTTP_TIMEOUT
+    ) as response:
+        response.raise_for_status()
+        if response.status_code != 206:
+            raise _RangesUnsupported(f"Server ignored range request bytes={start}-{end}")
+        offset = start
+        while True:
+            _check_cancel(cancel)
+            if not (chunk := response.raw.read(_AUDIO_CHUNK_SIZE)):
+                break
+            os.pwrite(fd, chunk, offset)
+            offset += len(chunk)
+            progress.update(len(chunk))
+    if offset != end + 1:
+        raise RuntimeError(f"Short read for bytes={start}-{end}: got {offset - start} bytes")
+
+
+def _download_ranges(
+    session: "requests.Session",
+    url: str,
+    output_path: Path,
+    total_size: int,
+    cancel: threading.Event | None = None,
+) -> None:
+    """Download the file as parallel byte ranges into a preallocated file."""
+    ranges = [
+        (start, min(start + _RANGE_PART_SIZE, total_size) - 1)
+        for start in range(0, total_size, _RANGE_PART_SIZE)
+    ]
+    progress = _Progress(total_size)
+    fd = _open_preallocated(output_path, total_size)
+    pool = ThreadPoolExecutor(max_workers=_RANGE_WORKERS)
+    try:
+        futures = [
+            pool.submit(_fetch_range, session, url, fd, start, end, progress, cancel)
+            for start, end in ranges
+        ]
+        for future in futures:
+            future.result()
+    except BaseException:
+        # Drop the queued ranges so a failed part (or Ctrl-C) doesn't first
+        # fetch the rest of the episode; only in-flight parts are waited on
+        pool.shutdown(wait=True, cancel_futures=True)
+        raise
+    else:
+        pool.shutdown()
+    finally:
+        os.close(fd)
+
+
+def download_audio(
+    url: str,
+    output_path: Path,
+    session: "requests.Session | None" = None,
+    cancel: threading.Event | None = None,
+) -> None:
+    """Download the audio file with progress indication.
+
+    Setting cancel (from another thread) stops the download at its next chunk.
+    """
     print(f"Downloading audio...")
+    session = session or get_session()
     
-    response = requests.get(url, stream=True)
-    response.raise_for_status()
+    # Probe for Range support; fall back to a single stream if the
+    # server won't say how big the file is or doesn't accept ranges.
+    head = session.head(
+        url,
+        allow_redirects=True,
+        headers={"Accept-Encoding": "identity"},
+        timeout=_HTTP_TIMEOUT,
+    )
+    total_size = int(head.headers.get("content-length", 0))
+    if (
+        head.ok
+        and head.headers.get("accept-ranges") == "bytes"
+        and total_size > _RANGE_PART_SIZE
+    ):
+        try:
+            # Use the post-redirect URL so each range skips the redirect chain
+            _download_ranges(session, head.url, output_path, total_size, cancel)
+        except _RangesUnsupported:
+            print("\n  Server ignored range requests; downloading in one stream")
+            _download_stream(session, url, output_path, cancel)
+    else:
+        _download_stream(session, url, output_path, cancel)
     
-    total_size = int(response.headers.get("content-length", 0))
-    downloaded = 0
+    print(f"\n  Saved to: {output_path}")
+
+
+def decode_audio(audio_path: Path) -> "np.ndarray":
+    """Decode audio to 16 kHz mono float32 PCM, the samples Whisper consumes.
+
+    ffmpeg writes the PCM to a pipe, as mlx_whisper.audio.load_audio does, so
+    the decoded episode never round-trips through disk.
+    """
+    import numpy as np
     
-    with open(output_path, "wb") as f:
-        for chunk in response.iter_content(chunk_size=8192):
-            f.write(chunk)
-            downloaded += len(chunk)
-            if total_size:
-                pct = (downloaded / total_size) * 100
-                print(f"\r  {downloaded / 1_000_000:.1f} MB / {total_size / 1_000_000:.1f} MB ({pct:.0f}%)", end="")
+    proc = subprocess.run(
+        [
+            "ffmpeg", "-nostdin", "-loglevel", "error", "-i", str(audio_path),
+            "-ar", str(_SAMPLE_RATE), "-ac", "1", "-f", "f32le", "-",
+        ],
+        stdout=subprocess.PIPE,
+        check=True,
+    )
+    return np.frombuffer(proc.stdout, dtype=np.float32)
+
+
+def _read_wav(wav_path: Path) -> "np.ndarray":
+    """Load a 16-bit PCM WAV written by ffmpeg as float32 samples in [-1, 1)."""
+    import numpy as np
     
-    print(f"\n  Saved to: {output_path}")
+    with wave.open(str(wav_path), "rb") as wav:
+        frames = wav.readframes(wav.getnframes())
+    return np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+def _audio_input(audio: "Path | np.ndarray") -> "str | np.ndarray":
+    """Adapt a path or decoded samples to what mlx_whisper accepts."""
+    return str(audio) if isinstance(audio, Path) else audio
+
+
+class Transcriber:
+    """MLX Whisper model loaded once and reused for every transcription."""
+
+    def __init__(self, path_or_hf_repo: str = _WHISPER_MODEL):
+        print(f"Loading {path_or_hf_repo}...")
+        
+        import mlx.core as mx
+        from mlx_whisper.transcribe import ModelHolder
+        
+        self.path_or_hf_repo = path_or_hf_repo
+        # mlx_whisper.transcribe() fetches its model from ModelHolder, so
+        # loading it there keeps it resident for all later calls
+        self.model = ModelHolder.get_model(path_or_hf_repo, mx.float16)
+
+    def segments(self, audio: "Path | np.ndarray") -> Iterator[str]:
+        """Transcribe with mlx_whisper's sliding window, yielding segment texts."""
+        import mlx_whisper
+        
+        result = mlx_whisper.transcribe(
+            _audio_input(audio),
+            path_or_hf_repo=self.path_or_hf_repo,
+#             condition_on_previous_text=False,
+            # False keeps the progress bar but skips printing every segment
+            verbose=False,
+        )
+        # result["text"] is just these joined; hand out the segments instead
+        # so callers can write them without building another full copy
+        for segment in result["segments"]:
+            yield segment["text"]
+
+    def batched_segments(
+        self, audio: "Path | np.ndarray", batch_size: int
+    ) -> Iterator[str]:
+        """Transcribe fixed 30 s windows, batch_size per forward pass, yielding texts."""
+        import mlx.core as mx
+        from mlx_whisper.audio import N_FRAMES, load_audio, log_mel_spectrogram, pad_or_trim
+        from mlx_whisper.decoding import DecodingOptions, decode
+        
+        if isinstance(audio, Path):
+            audio = load_audio(str(audio))
+        mel = log_mel_spectrogram(audio, n_mels=self.model.dims.n_mels)
+        # mlx_whisper mels are (frames, n_mels); cut along time into 3000-frame tiles
+        windows = [
+            pad_or_trim(mel[start : start + N_FRAMES], N_FRAMES, axis=-2)
+            for start in range(0, mel.shape[0], N_FRAMES)
+        ]
+        # Detect the language once, as transcribe() does, rather than letting
+        # decode() guess it again for every window
+        if self.model.is_multilingual:
+            _, probs = self.model.detect_language(windows[0].astype(mx.float16))
+            language = max(probs, key=probs.get)
+        else:
+            language = "en"
+        options = DecodingOptions(language=language, without_timestamps=True)
+        
+        separator = ""
+        for start in range(0, len(windows), batch_size):
+            batch = mx.stack(windows[start : start + batch_size]).astype(mx.float16)
+            # decode() runs the encoder once over the whole batch, then decodes
+            # every window in lockstep
+            for result in decode(self.model, batch, options):
+                # Silent windows otherwise come back as hallucinated text
+                if (
+                    result.no_speech_prob > _NO_SPEECH_THRESHOLD
+                    and result.avg_logprob < _LOGPROB_THRESHOLD
+                ):
+                    continue
+                if result.text:
+                    yield separator + result.text
+                    separator = " "
+            print(f"\r  {min(start + batch_size, len(windows))} / {len(windows)} windows", end="")
+        print()
+
+
+def _write_transcript(pieces: Iterable[str], output_path: Path) -> None:
+    """Write transcript pieces to output_path as they are produced.
+
+    Pieces go to a .part file that only replaces output_path once the last
+    one is written, so a failed run leaves an earlier transcript untouched.
+    """
+    part_path = output_path.with_suffix(".txt.part")
+    try:
+        with open(part_path, "w") as f:
+            for piece in pieces:
+                f.write(piece)
+    except BaseException:
+        part_path.unlink(missing_ok=True)
+        raise
+    os.replace(part_path, output_path)
+    print(f"  Transcript saved to: {output_path}")
 
 
-def transcribe_audio(audio_path: Path, output_path: Path) -> str:
+def transcribe_audio(
+    audio: "Path | np.ndarray",
+    output_path: Path,
+    transcriber: Transcriber | None = None,
+) -> None:
     """Transcribe audio using MLX Whisper."""
+    transcriber = transcriber or Transcriber()
     print(f"Transcribing with MLX Whisper (this may take a few minutes)...")
     
-    import mlx_whisper
-    
-    # Use the large-v3-turbo model for good balance of speed and accuracy
-    # Other options: "mlx-community/whisper-tiny-mlx" (fastest, less accurate)
-    #                "mlx-community/whisper-large-v3-mlx" (most accurate, slower)
-    result = mlx_whisper.transcribe(
-        str(audio_path),
-#         path_or_hf_repo="mlx-community/whisper-large-v3-turbo",
-        path_or_hf_repo="mlx-community/whisper-large-v3-mlx",
-#         condition_on_previous_text=False,
-        verbose=True,
-    )
+    _write_transcript(transcriber.segments(audio), output_path)
+
+
+def transcribe_batched(
+    audio: "Path | np.ndarray",
+    output_path: Path,
+    batch_size: int,
+    transcriber: Transcriber | None = None,
+) -> None:
+    """Transcribe audio as batches of fixed 30 s windows."""
+    transcriber = transcriber or Transcriber()
+    print(f"Transcribing with MLX Whisper in batches of {batch_size} windows...")
     
-    transcript = result["text"]
+    _write_transcript(transcriber.batched_segments(audio, batch_size), output_path)
+
+
+def _feed_ffmpeg(
+    session: "requests.Session", url: str, stdin, errors: list[Exception]
+) -> None:
+    """Stream the audio at url into ffmpeg's stdin, recording any failure."""
+    try:
+        with session.get(url, stream=True, timeout=_HTTP_TIMEOUT) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            shutil.copyfileobj(response.raw, stdin, length=_AUDIO_CHUNK_SIZE)
+    except BrokenPipeError:
+        # ffmpeg exited early; the caller reports its exit status
+        pass
+    except Exception as exc:
+        errors.append(exc)
+    finally:
+        with contextlib.suppress(BrokenPipeError):
+            stdin.close()
+
+
+def _stream_segments(
+    audio_url: str,
+    workdir: Path,
+    transcriber: Transcriber,
+    session: "requests.Session",
+) -> Generator[str, None, None]:
+    """Yield segment texts while ffmpeg cuts the downloading audio into pieces."""
+    # Segments are decoded straight to the 16 kHz mono PCM Whisper consumes:
+    # "-c copy" cannot put AAC from an M4A feed into .mp3 pieces, and WAV
+    # segments load without another ffmpeg run per segment
+    proc = subprocess.Popen(
+        [
+            "ffmpeg", "-loglevel", "error", "-i", "pipe:0", "-vn",
+            "-ar", str(_SAMPLE_RATE), "-ac", "1", "-c:a", "pcm_s16le",
+            "-f", "segment", "-segment_time", str(_SEGMENT_SECONDS),
+            "-segment_list", "pipe:1", "-segment_list_type", "flat",
+            str(workdir / "segment_%05d.wav"),
+        ],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+    )
+    errors: list[Exception] = []
+    feeder = threading.Thread(
+        target=_feed_ffmpeg, args=(session, audio_url, proc.stdin, errors), daemon=True
+    )
+    feeder.start()
     
-    # Save transcript
-    output_path.write_text(transcript)
-    print(f"  Transcript saved to: {output_path}")
+    try:
+        # ffmpeg lists each segment on stdout once it is complete, so segment N
+        # is transcribed while later segments are still downloading
+        for line in proc.stdout:
+            segment_path = workdir / line.decode().strip()
+            yield from transcriber.segments(_read_wav(segment_path))
+            segment_path.unlink()
+        
+        feeder.join()
+    finally:
+        # On an error or early close, stop ffmpeg before the temp dir is
+        # removed; the feeder then ends at its next write to the dead pipe
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+        proc.stdout.close()
     
-    return transcript
+    if errors:
+        raise errors[0]
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg exited with status {proc.returncode}")
 
 
-def main():
-    if len(sys.argv) != 2:
-        print(f"Usage: {sys.argv[0]} <overcast_url>")
-        print(f"Example: {sys.argv[0]} https://overcast.fm/+AAbggn-BZtw")
-        sys.exit(1)
-    
-    overcast_url = sys.argv[1]
+def transcribe_stream(
+    audio_url: str,
+    output_path: Path,
+    workdir: Path,
+    transcriber: Transcriber | None = None,
+    session: "requests.Session | None" = None,
+) -> None:
+    """Download and transcribe concurrently, one 30 s segment at a time."""
+    transcriber = transcriber or Transcriber()
+    session = session or get_session()
+    print(f"Streaming and transcribing with MLX Whisper...")
     
+    # closing() makes sure ffmpeg is stopped even if writing the transcript fails
+    with contextlib.closing(
+        _stream_segments(audio_url, workdir, transcriber, session)
+    ) as pieces:
+        _write_transcript(pieces, output_path)
+
+
+def _output_path(title: str | None) -> Path:
+    """Return where the transcript for an episode titled title is saved."""
+    safe_title = sanitize_filename(title) if title else "podcast"
+    output_dir = Path.cwd() / "output"
+    output_dir.mkdir(exist_ok=True)
+    return output_dir / f"{safe_title}.txt"
+
+
+def transcribe_episode(
+    overcast_url: str,
+    transcriber: Transcriber | None = None,
+    *,
+    stream: bool = False,
+    batch_size: int | None = None,
+) -> Path:
+    """Fetch, download and transcribe one episode; return the transcript path."""
     # Step 1: Fetch and parse the Overcast page
     print(f"Fetching: {overcast_url}")
-    html = fetch_page(overcast_url)
+    page = fetch_page(overcast_url)
     
-    title = extract_title(html)
-    audio_url = extract_audio_url(html)
+    title, audio_url = extract_metadata(page)
     
     if not audio_url:
-        print("❌ Could not find audio URL")
-        sys.exit(1)
+        raise MetadataNotFound(f"Could not find audio URL on {overcast_url}")
     
     print(f"Title: {title or 'Unknown'}")
     print(f"Audio URL: {audio_url}")
     
-    # Step 2: Download the audio
-    safe_title = sanitize_filename(title) if title else "podcast"
-    
     with tempfile.TemporaryDirectory() as tmpdir:
-        audio_path = Path(tmpdir) / "episode.mp3"
-        download_audio(audio_url, audio_path)
-        
-        # Step 3: Transcribe
-        output_dir = Path.cwd() / "output"
-        output_dir.mkdir(exist_ok=True)
-        output_path = output_dir / f"{safe_title}.txt"
-        transcript = transcribe_audio(audio_path, output_path)
+        if stream:
+            # Steps 2 and 3 overlapped: download while transcribing
+            output_path = _output_path(title)
+            transcribe_stream(audio_url, output_path, Path(tmpdir), transcriber)
+        else:
+            # Step 2: Download the audio. Start it first and, while it runs,
+            # pick the output name and load the model on this thread.
+            audio_path = Path(tmpdir) / "episode.mp3"
+            cancel = threading.Event()
+            pool = ThreadPoolExecutor(max_workers=1)
+            download = pool.submit(download_audio, audio_url, audio_path, cancel=cancel)
+            try:
+                output_path = _output_path(title)
+                transcriber = transcriber or Transcriber()
+                download.result()
+            except BaseException:
+                # Ctrl-C or a failed model load: stop the download at its next
+                # chunk instead of letting the rest of the episode finish first
+                cancel.set()
+                pool.shutdown(wait=True, cancel_futures=True)
+                raise
+            else:
+                pool.shutdown()
+            samples = decode_audio(audio_path)
+            
+            # Step 3: Transcribe
+            if batch_size:
+                transcribe_batched(samples, output_path, batch_size, transcriber)
+            else:
+                transcribe_audio(samples, output_path, transcriber)
+    
+    return output_path
+
+
+def _serve_one(overcast_url: str, transcriber: Transcriber, options: dict) -> str:
+    """Run one job for serve(); return a one-line status instead of raising."""
+    try:
+        output_path = transcribe_episode(overcast_url, transcriber, **options)
+    except Exception as exc:
+        print(f"❌ {overcast_url}: {exc}")
+        return f"error {exc}"
+    print(f"✅ Transcript saved to: {output_path}")
+    return f"ok {output_path}"
+
+
+def _serve_connection(conn: socket.socket, transcriber: Transcriber, options: dict) -> None:
+    """Handle one socket client: a URL per line in, a status line per URL out."""
+    # Separate reader and writer: a text-mode "rw" file drops buffered input
+    # whenever it is written to
+    with (
+        conn,
+        conn.makefile("r", encoding="utf-8") as incoming,
+        conn.makefile("w", encoding="utf-8") as replies,
+    ):
+        for line in incoming:
+            if url := line.strip():
+                replies.write(_serve_one(url, transcriber, options) + "\n")
+                replies.flush()
+
+
+def _is_socket(path: str) -> bool:
+    """Whether path exists and is a Unix socket (without following symlinks)."""
+    try:
+        return stat.S_ISSOCK(os.lstat(path).st_mode)
+    except FileNotFoundError:
+        return False
+
+
+def serve(transcriber: Transcriber, socket_path: str | None = None, **options) -> None:
+    """Transcribe Overcast URLs, one per line, keeping the model loaded.
+
+    URLs are read from stdin, or from clients of a Unix socket at socket_path;
+    socket clients get an "ok <path>" or "error <message>" line per URL.
+    """
+    if socket_path is None:
+        print("Reading Overcast URLs from stdin, one per line...")
+        for line in sys.stdin:
+            if url := line.strip():
+                _serve_one(url, transcriber, options)
+        return
+    
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        # Clear a stale socket from an earlier run, but never another file:
+        # bind() then fails with EADDRINUSE instead of deleting it
+        if _is_socket(socket_path):
+            os.unlink(socket_path)
+        server.bind(socket_path)
+        server.listen()
+        print(f"Listening on {socket_path}")
+        try:
+            while True:
+                conn, _ = server.accept()
+                try:
+                    _serve_connection(conn, transcriber, options)
+                except OSError as exc:
+                    # A client hanging up early must not take the daemon down
+                    print(f"❌ Client connection failed: {exc}")
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(socket_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Extract audio from Overcast links and transcribe with Whisper",
+        epilog="Example: %(prog)s https://overcast.fm/+AAbggn-BZtw",
+    )
+    parser.add_argument("overcast_url", nargs="?")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--stream",
+        action="store_true",
+        help="transcribe 30 s segments while the audio is still downloading",
+    )
+    mode.add_argument(
+        "--batch-size",
+        type=int,
+        metavar="N",
+        help="transcribe fixed 30 s windows, N per batched forward pass",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="keep the model loaded and transcribe URLs read one per line",
+    )
+    parser.add_argument(
+        "--socket",
+        metavar="PATH",
+        help="with --serve, read URLs from this Unix socket instead of stdin",
+    )
+    args = parser.parse_args()
+    if args.batch_size is not None and args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+    if args.socket and not args.serve:
+        parser.error("--socket requires --serve")
+    if args.socket and os.path.lexists(args.socket) and not _is_socket(args.socket):
+        parser.error(f"--socket {args.socket} exists and is not a socket")
+    if args.serve == bool(args.overcast_url):
+        parser.error("give either an overcast_url or --serve")
+    
+    options = {"stream": args.stream, "batch_size": args.batch_size}
+    
+    if args.serve:
+        with contextlib.suppress(KeyboardInterrupt):
+            serve(Transcriber(), args.socket, **options)
+        return
+    
+    try:
+        output_path = transcribe_episode(args.overcast_url, **options)
+    except MetadataNotFound as exc:
+        print(f"❌ {exc}")
+        sys.exit(1)
     
     print(f"\n✅ Done! Transcript saved to: {output_path}")
     
     # Print first 500 chars as preview
-    print(f"\n--- Preview ---\n{transcript[:500]}...")
+    with open(output_path) as f:
+        print(f"\n--- Preview ---\n{f.read(500)}...")
 
 
 if __name__ == "__main__":